@@ -4,14 +4,189 @@
 
 import os
 import re
-import requests
-from dataclasses import dataclass
-from typing import List, Dict
+import json
+import time
+import asyncio
+import hashlib
+import argparse
+import copy
+import functools
+from collections import OrderedDict
+import sqlite3
+import httpx
+import orjson
+import numpy as np
+from dataclasses import dataclass, replace
+from typing import List, Dict, Optional, Union, Callable, Tuple
 from dotenv import load_dotenv
+from pydantic import BaseModel, ValidationError
+from tenacity import (
+    retry, retry_if_exception, stop_after_attempt, wait_random_exponential
+)
 
 load_dotenv()
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
 print("DEBUG API KEY loaded:", bool(OPENROUTER_API_KEY))
+# only needed for run_batch (OpenAI Batch API)
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+
+# optional OpenAI-compatible local server (vLLM, llama.cpp) for the
+# gpt-4o-mini stages, e.g. TRIADIC_LOCAL_LLM_URL=http://localhost:8000/v1
+LOCAL_LLM_URL = os.getenv("TRIADIC_LOCAL_LLM_URL")
+LOCAL_LLM_MODEL = os.getenv("TRIADIC_LOCAL_LLM_MODEL", "meta-llama/Llama-3.1-8B-Instruct")
+
+# set TRIADIC_NO_CACHE=1 to bypass the response cache (exploratory runs)
+NO_CACHE = os.getenv("TRIADIC_NO_CACHE", "").lower() in ("1", "true", "yes")
+
+# attempts per model call before it gives up on transient errors
+MAX_ATTEMPTS = 5
+
+# cached extractions needed before the local model is tried
+RAG_MIN_EXAMPLES = 3
+
+
+# ============================================================
+# FILTER PATTERNS (compiled once at import)
+# ============================================================
+
+# incomplete trailing word left by a truncated generation
+_TRAIL_WORD = re.compile(r"\b\w+$")
+
+# conceptual / subjective fluff stripped from explanations
+_SANITIZE_FLUFF = re.compile(
+    r"perceive|interpreted|heard as|listener|music|"
+    r"emotion|harmony|experience|sensation"
+)
+
+# word tokens for whole-word filtering ("process" must not hit "processor")
+_WORD_RE = re.compile(r"[a-z]+")
+
+# abstract / process nouns that disqualify a NEGATIVE item; plurals are
+# listed too since models usually answer "sound waves", "processes"
+_BANNED_NEG = frozenset({
+    "wave", "propagation", "disturbance", "region",
+    "pattern", "flow", "motion", "compression",
+    "rarefaction", "nearby", "neighboring", "process",
+    "interaction",
+    "waves", "propagations", "disturbances", "regions",
+    "patterns", "flows", "motions", "compressions",
+    "rarefactions", "processes", "interactions"
+})
+
+# property words, banned alone or when followed by another word
+_PROPERTY_KEYWORDS = frozenset({
+    "density", "energy", "force",
+    "densities", "energies", "forces"
+})
+
+# causal verbs that disqualify a POSITIVE item (matched on words and word pairs)
+_BANNED_VERBS = frozenset({"creates", "leads to", "results in", "causes", "produces"})
+
+# one list item per line, bullets and padding stripped from both ends
+_ITEM_RE = re.compile(r"^[ \t\-*•]*(.*?)[ \t\r\-*•]*$", re.MULTILINE)
+
+
+# ============================================================
+# STREAM STOP PREDICATES
+# ============================================================
+
+# A stop predicate returns None while the stream should continue, and the
+# text to keep once it has enough (which may drop an unfinished tail).
+
+def _complete_text(buffer: str) -> str:
+    # the text after the last newline may still be mid-generation
+    return buffer[:buffer.rfind("\n") + 1]
+
+
+def _stop_after_lines(n: int) -> Callable[[str], Optional[str]]:
+    # n complete (newline-terminated) non-empty lines; the partial line
+    # after them is cut so it can't become a list item
+    def stop(buffer: str) -> Optional[str]:
+        text = _complete_text(buffer)
+        if sum(1 for l in text.splitlines() if l.strip()) >= n:
+            return text
+        return None
+    return stop
+
+
+def _json_complete(buffer: str) -> Optional[str]:
+    # cheap gate first; only a closing brace can finish the object
+    if not buffer.rstrip().endswith("}"):
+        return None
+    try:
+        orjson.loads(buffer)
+        return buffer
+    except ValueError:
+        return None
+
+
+# ============================================================
+# RETRY POLICY (transient provider errors)
+# ============================================================
+
+def _is_transient(e: BaseException) -> bool:
+    # rate limits, provider hiccups and slow reads are worth another try;
+    # other 4xx (bad request, auth) will fail the same way again
+    if isinstance(e, httpx.HTTPStatusError):
+        return e.response.status_code == 429 or e.response.status_code >= 500
+    return isinstance(e, httpx.ReadTimeout)
+
+
+# longest single wait between attempts, Retry-After included
+MAX_BACKOFF = 30
+
+_backoff = wait_random_exponential(min=1, max=MAX_BACKOFF)
+
+
+def _wait_retry_after(retry_state) -> float:
+    # on 429 the provider says how long to wait (capped so one call can't
+    # stall its topic for an hour); otherwise jittered backoff
+    e = retry_state.outcome.exception()
+    if isinstance(e, httpx.HTTPStatusError) and e.response.status_code == 429:
+        try:
+            return min(float(e.response.headers["Retry-After"]), MAX_BACKOFF)
+        except (KeyError, ValueError):
+            pass
+    return _backoff(retry_state)
+
+
+# ============================================================
+# STAGE MEMOIZATION (in-process LRU)
+# ============================================================
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def _copy(value):
+    # stage outputs are str or List[str]; callers get their own lists
+    return list(value) if isinstance(value, list) else value
+
+
+def cache_stage(key_fn: Callable, maxsize: int = 1024):
+    # lru_cache can't hash list arguments, so each stage names its own key;
+    # the cache lives on the agent instance and skips empty (failed) outputs
+    def decorator(fn):
+        attr = f"_stage_cache_{fn.__name__}"
+
+        @functools.wraps(fn)
+        async def wrapper(self, arg, *args, **kwargs):
+            if NO_CACHE:
+                return await fn(self, arg, *args, **kwargs)
+            cache = self.__dict__.setdefault(attr, OrderedDict())
+            key = key_fn(self, arg)
+            if key in cache:
+                cache.move_to_end(key)
+                return _copy(cache[key])
+            result = await fn(self, arg, *args, **kwargs)
+            if result:
+                cache[key] = _copy(result)
+                if len(cache) > maxsize:
+                    cache.popitem(last=False)
+            return result
+        return wrapper
+    return decorator
+
 
 # ============================================================
 # QUERY / TOPIC UNDER TEST
@@ -34,17 +209,308 @@ class TriadicResult:
     diagnostics: List[str]
 
 
+# schema the fused single-call mode must return
+class TriadModel(BaseModel):
+    explanation: str
+    negative: List[str]
+    neutral: List[str]
+    positive: List[str]
+
+
+# ============================================================
+# RESPONSE CACHE (exact match, on disk)
+# ============================================================
+
+class LLMCache:
+
+    def __init__(self, path: str, enabled: bool = True):
+        self.enabled = enabled
+        self._db = None
+        if not enabled:
+            return
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS cache "
+            "(key TEXT PRIMARY KEY, value TEXT, ts INTEGER)"
+        )
+        self._db.commit()
+
+    @staticmethod
+    def cache_key(model: str, prompt: str, max_tokens: int, stopped_early: bool = False) -> str:
+        key = {"m": model, "p": prompt, "t": max_tokens}
+        # early-stopped streams may be truncated; keep them apart
+        if stopped_early:
+            key["s"] = True
+        payload = json.dumps(key, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        row = self._db.execute("SELECT value FROM cache WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: str):
+        if not self.enabled:
+            return
+        self._db.execute(
+            "INSERT OR REPLACE INTO cache (key, value, ts) VALUES (?, ?, ?)",
+            (key, value, int(time.time()))
+        )
+        self._db.commit()
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+# ============================================================
+# SEMANTIC CACHE (paraphrased topics -> stored TriadicResult)
+# ============================================================
+
+class SemanticCache:
+
+    # newest embeddings kept in float32 for exact re-ranking; the first
+    # RECENT of them also fit the per-dimension ranges of the int8 index
+    RECENT = 1000
+    TOP_K = 8
+
+    def __init__(self, path: str, threshold: float = 0.92, enabled: bool = True):
+        self.path = path
+        self.threshold = threshold
+        self.enabled = enabled
+        self.recent = np.zeros((0, 384), dtype=np.float32)
+        self.index = None
+        self.results: List[TriadicResult] = []
+        self._dirty = False
+        if not enabled:
+            return
+
+        # heavy optional dependencies (torch, faiss): only load when used
+        import faiss
+        from sentence_transformers import SentenceTransformer
+
+        # int8 per-dimension scalar quantization: 4x smaller than float32
+        self.index = faiss.IndexScalarQuantizer(
+            384, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT
+        )
+
+        # loaded once; encoding a topic locally takes a few ms
+        self.model = SentenceTransformer("all-MiniLM-L6-v2")
+
+        res_path = os.path.join(path, "results.json")
+        if not os.path.exists(res_path):
+            return
+        with open(res_path, "rb") as f:
+            self.results = [TriadicResult(**r) for r in orjson.loads(f.read())]
+
+        index_path = os.path.join(path, "index.faiss")
+        recent_path = os.path.join(path, "recent.npy")
+        if os.path.exists(recent_path):
+            self.recent = np.load(recent_path)
+            if os.path.exists(index_path):
+                self.index = faiss.read_index(index_path)
+
+    def encode(self, topic: str) -> np.ndarray:
+        return self.model.encode(topic, normalize_embeddings=True).astype(np.float32)
+
+    def lookup(self, e: np.ndarray) -> Optional[TriadicResult]:
+        if not self.enabled or not self.results:
+            return None
+
+        # ids below base live only in the int8 index
+        base = len(self.results) - len(self.recent)
+        best_id, best = -1, -np.inf
+
+        # rows are unit-norm, so one matmul gives exact cosine similarities
+        if len(self.recent):
+            sims = self.recent @ e
+            i = int(np.argmax(sims))
+            best_id, best = base + i, float(sims[i])
+
+        # approximate int8 scores for older entries
+        if self.index.is_trained and self.index.ntotal > len(self.recent):
+            D, I = self.index.search(e.reshape(1, -1), self.TOP_K)
+            for d, i in zip(D[0], I[0]):
+                if 0 <= i < base and d > best:
+                    best_id, best = int(i), float(d)
+
+        if best >= self.threshold:
+            return self.results[best_id]
+        return None
+
+    def add(self, e: np.ndarray, result: TriadicResult):
+        if not self.enabled:
+            return
+        self._insert(e)
+        self.results.append(result)
+        self._dirty = True
+
+    def _insert(self, e: np.ndarray):
+        self.recent = np.vstack([self.recent, e[None, :]])
+        if self.index.is_trained:
+            self.index.add(e[None, :])
+        elif len(self.recent) >= self.RECENT:
+            # enough real embeddings to fit the quantizer ranges
+            self.index.train(self.recent)
+            self.index.add(self.recent)
+        self.recent = self.recent[-self.RECENT:]
+
+    def save(self):
+        if not self.enabled or not self._dirty:
+            return
+        os.makedirs(self.path, exist_ok=True)
+        np.save(os.path.join(self.path, "recent.npy"), self.recent)
+        if self.index.is_trained:
+            import faiss
+            faiss.write_index(self.index, os.path.join(self.path, "index.faiss"))
+        # orjson serializes the dataclasses directly
+        with open(os.path.join(self.path, "results.json"), "wb") as f:
+            f.write(orjson.dumps(self.results))
+        self._dirty = False
+
+
+# ============================================================
+# EXAMPLE STORE (cached extractions reused as few-shot demos)
+# ============================================================
+
+class ExampleStore:
+
+    def __init__(self, path: str, encode: Callable[[str], np.ndarray]):
+        self.path = path
+        self.encode = encode
+        self.E = np.zeros((0, 384), dtype=np.float32)
+        self.pairs: List[Tuple[str, List[str]]] = []
+        self._dirty = False
+
+        if os.path.exists(path + ".npy") and os.path.exists(path + ".json"):
+            self.E = np.load(path + ".npy")
+            with open(path + ".json", "rb") as f:
+                self.pairs = [(text, output) for text, output in orjson.loads(f.read())]
+        self._texts = {text for text, _ in self.pairs}
+
+    def add(self, text: str, output: List[str]):
+        # reruns replay the same cached answer; one demo per input is enough
+        if text in self._texts:
+            return
+        self._texts.add(text)
+        self.E = np.vstack([self.E, self.encode(text)[None, :]])
+        self.pairs.append((text, output))
+        self._dirty = True
+
+    def nearest(self, text: str, k: int = 3) -> List[Tuple[str, List[str]]]:
+        sims = self.E @ self.encode(text)
+        return [self.pairs[i] for i in np.argsort(-sims)[:k]]
+
+    def save(self):
+        if not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        np.save(self.path + ".npy", self.E)
+        with open(self.path + ".json", "wb") as f:
+            f.write(orjson.dumps(self.pairs))
+        self._dirty = False
+
+
 # ============================================================
 # MODEL WRAPPER
 # ============================================================
 
 class TriadicAgent:
 
-    def __init__(self):
+    def __init__(self, max_concurrency: int = 16, mode: str = "sequential",
+                 stream: bool = True, prefetch_budget: int = 20,
+                 speculate: bool = False):
         if not OPENROUTER_API_KEY:
             raise ValueError("Missing OPENROUTER_API_KEY")
+        if mode not in ("sequential", "fused"):
+            raise ValueError(f"Unknown mode: {mode}")
+
+        # "sequential" = four dependent calls, "fused" = one JSON call
+        self.mode = mode
+        # stream list/JSON stages and hang up once enough has arrived
+        self.stream = stream
+        # start the next stage on a stable partial list (needs streaming)
+        self.speculate = speculate and stream
+
+        # one pooled HTTP/2 client shared by every call: keep-alive skips
+        # the TLS handshake per stage and HTTP/2 multiplexes concurrent calls
+        self._client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(60.0, connect=5.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        )
+        # cap in-flight requests so large batches don't flood the loop
+        self._sem = asyncio.Semaphore(max_concurrency)
+
+        # temperature is low, so identical prompts are safe to replay
+        self.cache = LLMCache(".triadic_cache.sqlite", enabled=not NO_CACHE)
+        # paraphrases of an earlier topic reuse its whole triad; each mode
+        # keeps its own store so sequential vs fused stays comparable
+        semantic_path = ".triadic_semantic" if mode == "sequential" else f".triadic_semantic_{mode}"
+        self.semantic = SemanticCache(semantic_path, enabled=not NO_CACHE)
+
+        # background runs of likely follow-up topics, one at a time,
+        # capped at prefetch_budget runs per session
+        self._prefetch_budget = prefetch_budget
+        self._prefetch_sem = asyncio.Semaphore(1)
+        self._prefetch_tasks = set()
+
+        # with a local server configured, NEGATIVE/POSITIVE extraction is
+        # tried there first, prompted with the most similar earlier
+        # gpt-4o-mini extractions as few-shot examples
+        self._local = None
+        self.neg_examples = None
+        self.pos_examples = None
+        if LOCAL_LLM_URL and self.semantic.enabled:
+            from openai import AsyncOpenAI
+            self._local = AsyncOpenAI(base_url=LOCAL_LLM_URL, api_key="local")
+            self.neg_examples = ExampleStore(
+                os.path.join(".triadic_semantic", "neg_examples"), self.semantic.encode
+            )
+            self.pos_examples = ExampleStore(
+                os.path.join(".triadic_semantic", "pos_examples"), self.semantic.encode
+            )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        # for callers that don't use "async with"
+        for task in self._prefetch_tasks:
+            task.cancel()
+        await asyncio.gather(*self._prefetch_tasks, return_exceptions=True)
+        await self._client.aclose()
+        self.cache.close()
+        self.semantic.save()
+        if self._local is not None:
+            await self._local.close()
+            self.neg_examples.save()
+            self.pos_examples.save()
+
+    @staticmethod
+    def _response_key(model: str, prompt: str, max_tokens: int = 500,
+                      stream: bool = False,
+                      stop_predicate: Optional[Callable[[str], Optional[str]]] = None) -> str:
+        # the key acall stores a response under; only a stream with a stop
+        # predicate can end early, so only that gets the early-stop key
+        return LLMCache.cache_key(model, prompt, max_tokens, stream and stop_predicate is not None)
+
+    async def acall(self, model: str, prompt: str, max_tokens: int = 500,
+                    response_format: Optional[dict] = None,
+                    stream: bool = False,
+                    stop_predicate: Optional[Callable[[str], Optional[str]]] = None,
+                    on_partial: Optional[Callable[[str], None]] = None):
+        key = self._response_key(model, prompt, max_tokens, stream, stop_predicate)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
 
-    def call(self, model: str, prompt: str, max_tokens: int = 500):
         url = "https://openrouter.ai/api/v1/chat/completions"
         headers = {
             "Authorization": f"Bearer {OPENROUTER_API_KEY}",
@@ -56,13 +522,102 @@ class TriadicAgent:
             "temperature": 0.1,
             "max_tokens": max_tokens
         }
+        if response_format is not None:
+            body["response_format"] = response_format
         try:
-            r = requests.post(url, json=body, headers=headers).json()
-            return r["choices"][0]["message"]["content"].strip()
+            content = await self._do_call(url, body, headers, stream, stop_predicate, on_partial)
+            content = content.strip()
+            if content:
+                self.cache.set(key, content)
+            return content
         except Exception as e:
+            # a rejected key fails every call; stop the run instead of
+            # feeding empty text into the downstream stages
+            if isinstance(e, httpx.HTTPStatusError) and e.response.status_code in (401, 403):
+                raise
             print("MODEL ERROR:", e)
             return ""
 
+    @retry(
+        retry=retry_if_exception(_is_transient),
+        wait=_wait_retry_after,
+        stop=stop_after_attempt(MAX_ATTEMPTS),
+        reraise=True
+    )
+    async def _do_call(self, url: str, body: dict, headers: dict, stream: bool,
+                       stop_predicate: Optional[Callable[[str], Optional[str]]],
+                       on_partial: Optional[Callable[[str], None]]) -> str:
+        # the semaphore is released before tenacity sleeps between attempts
+        async with self._sem:
+            if stream:
+                return await self._stream(url, body, headers, stop_predicate, on_partial)
+            # headers already carry Content-Type: application/json
+            r = await self._client.post(url, content=orjson.dumps(body), headers=headers)
+            r.raise_for_status()
+            return orjson.loads(r.content)["choices"][0]["message"]["content"]
+
+    async def _stream(self, url: str, body: dict, headers: dict,
+                      stop_predicate: Optional[Callable[[str], Optional[str]]],
+                      on_partial: Optional[Callable[[str], None]] = None):
+        # OpenRouter SSE: "data: {chunk}" lines, ": ..." keep-alives, "data: [DONE]"
+        buffer = ""
+        async with self._client.stream(
+            "POST", url, content=orjson.dumps({**body, "stream": True}), headers=headers
+        ) as r:
+            if r.status_code != 200:
+                await r.aread()
+                r.raise_for_status()
+            async for line in r.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+                data = line[len("data: "):]
+                if data == "[DONE]":
+                    break
+                delta = orjson.loads(data)["choices"][0]["delta"].get("content") or ""
+                buffer += delta
+                # complete lines only change when a newline arrives
+                if on_partial is not None and "\n" in delta:
+                    on_partial(buffer)
+                # leaving the block closes the response and stops generation
+                if delta and stop_predicate is not None:
+                    kept = stop_predicate(buffer)
+                    if kept is not None:
+                        buffer = kept
+                        break
+        return buffer
+
+
+    # ========================================================
+    # LOCAL MODEL (cache-as-RAG few-shot)
+    # ========================================================
+    async def local_call(self, store: Optional[ExampleStore], query: str,
+                         prompt: str, cache_key: str) -> Optional[str]:
+        # None means "not routed": the caller falls back to OpenRouter
+        if self._local is None or len(store.pairs) < RAG_MIN_EXAMPLES:
+            return None
+        # an exact cached gpt-4o-mini answer is faster and reproducible
+        if self.cache.get(cache_key) is not None:
+            return None
+
+        shots = "\n".join(
+            f"EXAMPLE {i}\nINPUT:\n\"\"\"{text}\"\"\"\nOUTPUT:\n" + "\n".join(output) + "\n"
+            for i, (text, output) in enumerate(store.nearest(query), 1)
+        )
+        try:
+            r = await self._local.chat.completions.create(
+                model=LOCAL_LLM_MODEL,
+                messages=[{
+                    "role": "user",
+                    "content": f"Worked examples of the expected output:\n\n{shots}{prompt}"
+                }],
+                temperature=0.1,
+                max_tokens=500
+            )
+            return (r.choices[0].message.content or "").strip()
+        except Exception as e:
+            print("LOCAL MODEL ERROR:", e)
+            return None
+
 
     # ========================================================
     # EXPLANATION SANITIZER (v7.0)
@@ -70,7 +625,11 @@ class TriadicAgent:
     def sanitize_explanation(self, explanation: str) -> str:
 
         # remove incomplete final sentence (common with some models)
-        explanation = re.sub(r"\b\w+$", "", explanation).strip()
+        explanation = _TRAIL_WORD.sub("", explanation).strip()
+
+        # a failed call leaves nothing to clean; don't turn it into "."
+        if not explanation:
+            return ""
 
         # enforce final period
         if not explanation.endswith("."):
@@ -81,12 +640,7 @@ class TriadicAgent:
         clean = " ".join(lines)
 
         # strip conceptual / subjective fluff
-        banned = [
-            "perceive", "interpreted", "heard as", "listener", "music",
-            "emotion", "harmony", "experience", "sensation"
-        ]
-        for b in banned:
-            clean = clean.replace(b, "")
+        clean = _SANITIZE_FLUFF.sub("", clean)
 
         return clean.strip()
 
@@ -94,7 +648,8 @@ class TriadicAgent:
     # ========================================================
     # EXPLANATION GENERATION (DeepSeek R1)
     # ========================================================
-    def build_explanation(self, topic: str) -> str:
+    @cache_stage(lambda self, topic: _digest(topic))
+    async def build_explanation(self, topic: str) -> str:
         prompt = f"""
 Explain the topic below in 3–6 sentences using ONLY physical causality:
 
@@ -103,15 +658,44 @@ Explain the topic below in 3–6 sentences using ONLY physical causality:
 No metaphor, no interpretation, no subjective description.
 Pure physical sequence of events.
 """
-        raw = self.call("deepseek/deepseek-r1", prompt)
+        raw = await self.acall("deepseek/deepseek-r1", prompt)
         return self.sanitize_explanation(raw)
 
 
     # ========================================================
     # NEGATIVE EXTRACTION (STRICT PHYSICAL)
     # ========================================================
-    def extract_negative(self, explanation: str) -> List[str]:
-        prompt = f"""
+    @cache_stage(lambda self, explanation: _digest(explanation))
+    async def extract_negative(self, explanation: str,
+                               on_partial: Optional[Callable[[List[str]], None]] = None
+                               ) -> List[str]:
+        prompt = self.negative_prompt(explanation)
+        stop = _stop_after_lines(10)
+        key = self._response_key(
+            "openai/gpt-4o-mini", prompt, stream=self.stream, stop_predicate=stop
+        )
+
+        raw = await self.local_call(self.neg_examples, explanation, prompt, key)
+        if raw is not None:
+            negative = self.parse_negative(raw)
+            if negative:
+                return negative
+
+        notify = None
+        if on_partial is not None:
+            notify = lambda buffer: on_partial(self.parse_negative(_complete_text(buffer)))
+
+        raw = await self.acall(
+            "openai/gpt-4o-mini", prompt,
+            stream=self.stream, stop_predicate=stop, on_partial=notify
+        )
+        negative = self.parse_negative(raw)
+        if negative and self.neg_examples is not None:
+            self.neg_examples.add(explanation, negative)
+        return negative
+
+    def negative_prompt(self, explanation: str) -> str:
+        return f"""
 Extract ONLY the physical initial components that exist BEFORE any process begins.
 
 Rules:
@@ -126,28 +710,29 @@ EXPLANATION:
 
 Output as a simple list, one item per line.
 """
-        raw = self.call("openai/gpt-4o-mini", prompt)
-        items = [l.strip(" -*•\t").lower() for l in raw.splitlines() if l.strip()]
 
-        # HARD FILTER TO ENSURE STRICT PHYSICAL COMPONENTS
-        banned = [
-            "wave", "propagation", "disturbance", "region",
-            "pattern", "flow", "motion", "compression",
-            "rarefaction", "nearby", "neighboring", "process",
-            "interaction"
-        ]
+    def parse_negative(self, raw: str) -> List[str]:
+        items = [m.lower() for m in _ITEM_RE.findall(raw) if m]
+        return self.filter_negative(items)
 
+    def filter_negative(self, items: List[str]) -> List[str]:
+
+        # HARD FILTER TO ENSURE STRICT PHYSICAL COMPONENTS
         clean = []
         for item in items:
-            if any(b in item for b in banned):
-                continue
-            # over-long phrases are usually explanations, not components
+            # over-long phrases are usually explanations, not components;
+            # rejecting them first spares tokenizing most of the raw output
             if len(item.split()) > 3:
                 continue
 
+            # tokenize once; both word checks below reuse it
+            tokens = _WORD_RE.findall(item)
+            if _BANNED_NEG.intersection(tokens):
+                continue
+
             # filter out some "pure property" words when they appear alone
-            property_keywords = ["density", "energy", "force"]
-            if any(pk == item or (pk + " " in item) for pk in property_keywords):
+            # or lead a phrase ("energy density"), but keep "kinetic energy"
+            if _PROPERTY_KEYWORDS.intersection(tokens[:-1] or tokens):
                 continue
 
             clean.append(item)
@@ -158,7 +743,10 @@ Output as a simple list, one item per line.
     # ========================================================
     # NEUTRAL INTERACTIONS (DeepSeek R1)
     # ========================================================
-    def extract_neutral(self, negative: List[str]) -> List[str]:
+    @cache_stage(lambda self, negative: _digest("\n".join(sorted(negative))))
+    async def extract_neutral(self, negative: List[str],
+                              on_partial: Optional[Callable[[List[str]], None]] = None
+                              ) -> List[str]:
 
         neg_list = "\n".join(f"- {n}" for n in negative)
 
@@ -177,18 +765,49 @@ NEGATIVE LIST:
 
 Write only the mechanisms.
 """
-        raw = self.call("deepseek/deepseek-r1", prompt)
-        return [l.strip().rstrip(".") + "." for l in raw.splitlines() if l.strip()]
+        notify = None
+        if on_partial is not None:
+            notify = lambda buffer: on_partial(
+                self.filter_neutral(_complete_text(buffer).splitlines())
+            )
+
+        raw = await self.acall(
+            "deepseek/deepseek-r1", prompt,
+            stream=self.stream and on_partial is not None, on_partial=notify
+        )
+        return self.filter_neutral(raw.splitlines())
+
+    def filter_neutral(self, items: List[str]) -> List[str]:
+        return [l.strip().rstrip(".") + "." for l in items if l.strip()]
 
 
     # ========================================================
     # POSITIVE STATES (Realization Filter)
     # ========================================================
-    def extract_positive(self, neutral: List[str]) -> List[str]:
+    @cache_stage(lambda self, neutral: _digest("\n".join(neutral)))
+    async def extract_positive(self, neutral: List[str]) -> List[str]:
+        prompt = self.positive_prompt(neutral)
+        neu_text = "\n".join(neutral)
+        key = self._response_key("openai/gpt-4o-mini", prompt)
+
+        raw = await self.local_call(self.pos_examples, neu_text, prompt, key)
+        if raw is not None:
+            positive = self.parse_positive(raw, neutral)
+            # one realized state per mechanism, or it's malformed
+            if positive and len(positive) == len(neutral):
+                return positive
+
+        raw = await self.acall("openai/gpt-4o-mini", prompt)
+        positive = self.parse_positive(raw, neutral)
+        if positive and self.pos_examples is not None:
+            self.pos_examples.add(neu_text, positive)
+        return positive
+
+    def positive_prompt(self, neutral: List[str]) -> str:
 
         neu_list = "\n".join(f"- {n}" for n in neutral)
 
-        prompt = f"""
+        return f"""
 Transform each NEUTRAL mechanism into a REALIZED STATE.
 
 Rules:
@@ -206,18 +825,19 @@ NEUTRAL MECHANISMS:
 
 Output one realized state per line, same order.
 """
-        raw = self.call("openai/gpt-4o-mini", prompt)
-        items = [l.strip(" -*•\t") for l in raw.splitlines() if l.strip()]
 
-        # Light filter: only remove obviously causal/meta lines
-        banned_verbs = [
-            "creates", "leads to", "results in", "causes", "produces"
-        ]
+    def parse_positive(self, raw: str, neutral: List[str]) -> List[str]:
+        items = [m for m in _ITEM_RE.findall(raw) if m]
+        return self.filter_positive(items, neutral)
 
+    def filter_positive(self, items: List[str], neutral: List[str]) -> List[str]:
+
+        # Light filter: only remove obviously causal/meta lines
         clean = []
         for it in items:
-            lower = it.lower()
-            if any(b in lower for b in banned_verbs):
+            tokens = _WORD_RE.findall(it.lower())
+            grams = set(tokens).union(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+            if grams & _BANNED_VERBS:
                 continue
             clean.append(it)
 
@@ -225,6 +845,70 @@ Output one realized state per line, same order.
         return clean[:len(neutral)]
 
 
+    # ========================================================
+    # FUSED TRIAD (single structured-JSON call)
+    # ========================================================
+    async def build_triad_single(self, topic: str) -> TriadicResult:
+        prompt = f"""
+Decompose the topic below into a strict physical triad.
+
+\"\"\"{topic}\"\"\"
+
+Return ONE JSON object with exactly these keys:
+  "explanation": string
+  "negative": list of strings
+  "neutral": list of strings
+  "positive": list of strings
+
+EXPLANATION rules:
+- 3–6 sentences using ONLY physical causality.
+- No metaphor, no interpretation, no subjective description.
+- Pure physical sequence of events.
+
+NEGATIVE rules (initial components that exist BEFORE any process begins):
+- MUST be concrete objects, particles, energies, or measurable physical states.
+- NO actions, NO processes, NO outcomes.
+- NO abstract nouns (like "disturbance", "propagation", "region", "speed").
+- 4–10 items MAX, each 1–3 words.
+
+NEUTRAL rules (HOW the NEGATIVE components interact):
+- 4–8 items, one sentence each.
+- Each must reference AT LEAST TWO items from the NEGATIVE list.
+- Pure causal mechanisms. No outcomes. No future consequences.
+
+POSITIVE rules (one REALIZED STATE per NEUTRAL item, same order):
+- MUST be either a pure noun phrase, OR a passive-perfect realized condition ("is established", "is stabilized", "is present", "is formed", "is maintained").
+- NO high-level causal verbs: no creates, leads to, results in, causes, produces.
+- MUST represent a completed physical condition that exists AFTER the mechanism.
+- DO NOT restate or paraphrase the neutral mechanism word-for-word.
+
+Output only the JSON object.
+"""
+        raw = await self.acall(
+            "openai/gpt-4o", prompt, max_tokens=1500,
+            response_format={"type": "json_object"},
+            stream=self.stream, stop_predicate=_json_complete
+        )
+        try:
+            triad = TriadModel.model_validate_json(raw)
+        except ValidationError as e:
+            print("FUSED PARSE ERROR:", e)
+            triad = TriadModel(explanation="", negative=[], neutral=[], positive=[])
+
+        # same sanitizer and filters as the sequential path
+        explanation = self.sanitize_explanation(triad.explanation) if triad.explanation else ""
+        negative = self.filter_negative(
+            [m.lower() for m in _ITEM_RE.findall("\n".join(triad.negative)) if m]
+        )
+        neutral = self.filter_neutral(triad.neutral)
+        positive = self.filter_positive(
+            [m for m in _ITEM_RE.findall("\n".join(triad.positive)) if m], neutral
+        )
+
+        diags = self.analyze(negative, neutral, positive)
+        return TriadicResult(topic, explanation, negative, neutral, positive, diags)
+
+
     # ========================================================
     # DIAGNOSTICS
     # ========================================================
@@ -244,26 +928,249 @@ Output one realized state per line, same order.
     # ========================================================
     # RUN TRIAD
     # ========================================================
-    def run(self, topic: str) -> TriadicResult:
+    async def run(self, topic: str, prefetch: bool = True) -> TriadicResult:
+        result, cached = await self._run(topic)
+
+        # warm the semantic cache with related topics while the caller is idle;
+        # after a cache hit the neighbourhood is most likely warm already
+        if prefetch and not cached and self.semantic.enabled and self._prefetch_budget > 0:
+            task = asyncio.create_task(self._prefetch(topic))
+            self._prefetch_tasks.add(task)
+            task.add_done_callback(self._prefetch_tasks.discard)
+
+        return result
+
+    async def _run(self, topic: str) -> Tuple[TriadicResult, bool]:
+        # returns (result, served from the semantic cache)
+
+        e = None
+        if self.semantic.enabled:
+            e = self.semantic.encode(topic)
+            hit = self.semantic.lookup(e)
+            if hit is not None:
+                # a private copy so callers can't mutate the stored triad
+                return replace(copy.deepcopy(hit), topic=topic), True
+
+        if self.mode == "fused":
+            result = await self.build_triad_single(topic)
+        else:
+            explanation = await self.build_explanation(topic)
+            if self.speculate:
+                negative, (neutral, positive) = await self._speculate(
+                    lambda cb: self.extract_negative(explanation, on_partial=cb),
+                    self._neutral_then_positive
+                )
+            else:
+                negative = await self.extract_negative(explanation)
+                neutral = await self.extract_neutral(negative)
+                positive = await self.extract_positive(neutral)
+
+            diags = self.analyze(negative, neutral, positive)
+            result = TriadicResult(topic, explanation, negative, neutral, positive, diags)
+
+        # only clean triads are worth serving to future paraphrases
+        if e is not None and not result.diagnostics:
+            self.semantic.add(e, copy.deepcopy(result))
+
+        return result, False
 
-        explanation = self.build_explanation(topic)
-        negative = self.extract_negative(explanation)
-        neutral = self.extract_neutral(negative)
-        positive = self.extract_positive(neutral)
+    # ========================================================
+    # SPECULATIVE PIPELINING
+    # ========================================================
+    # While a list stage is still streaming, the next stage is started on
+    # its partial output once >= min_items items have been stable for
+    # `settle` seconds. If the final list holds the same set of items the
+    # speculative result is kept; otherwise it is cancelled and the next
+    # stage reruns on the final list. Tradeoff: a kept result was built
+    # from the partial list's item order, and a discarded one still costs
+    # its tokens, so this buys latency with some extra spend.
+    async def _speculate(self, produce, consume, min_items: int = 4, settle: float = 0.5):
+        partial: List[str] = []
+        changed = asyncio.Event()
+
+        def on_partial(items: List[str]):
+            if items != partial:
+                partial[:] = items
+                changed.set()
+
+        producer = asyncio.create_task(produce(on_partial))
+        snapshot, spec = None, None
+        try:
+            while spec is None and not producer.done():
+                changed.clear()
+                waiter = asyncio.create_task(changed.wait())
+                await asyncio.wait(
+                    {producer, waiter}, timeout=settle,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                waiter.cancel()
+                if producer.done():
+                    break
+                if not changed.is_set() and len(partial) >= min_items:
+                    snapshot = list(partial)
+                    spec = asyncio.create_task(consume(snapshot))
+            final = await producer
+        except BaseException:
+            producer.cancel()
+            if spec is not None:
+                spec.cancel()
+            raise
+
+        if spec is not None:
+            if set(final) == set(snapshot):
+                return final, await spec
+            spec.cancel()
+        return final, await consume(final)
+
+    async def _neutral_then_positive(self, negative: List[str]) -> Tuple[List[str], List[str]]:
+        return await self._speculate(
+            lambda cb: self.extract_neutral(negative, on_partial=cb),
+            self.extract_positive
+        )
 
-        diags = self.analyze(negative, neutral, positive)
 
-        return TriadicResult(topic, explanation, negative, neutral, positive, diags)
+    # ========================================================
+    # BATCH MODE (OpenAI Batch API, non-interactive)
+    # ========================================================
+    # The gpt-4o-mini stages go through the Batch API at roughly half the
+    # unit cost, but each batch may take up to 24h. Explanations and
+    # NEUTRAL mechanisms still use OpenRouter. Meant for overnight runs.
+    async def run_batch(self, topics: List[str], poll_interval: float = 60.0
+                        ) -> List[TriadicResult]:
+        if not OPENAI_API_KEY:
+            raise ValueError("Missing OPENAI_API_KEY")
+        # optional dependency, only needed for batch mode
+        from openai import AsyncOpenAI
+        async with AsyncOpenAI(api_key=OPENAI_API_KEY) as client:
+            explanations = await asyncio.gather(*(self.build_explanation(t) for t in topics))
+
+            raw = await self._batch_complete(
+                client, [self.negative_prompt(e) for e in explanations], poll_interval
+            )
+            negatives = [self.parse_negative(r) for r in raw]
+
+            neutrals = await asyncio.gather(*(self.extract_neutral(n) for n in negatives))
+
+            raw = await self._batch_complete(
+                client, [self.positive_prompt(n) for n in neutrals], poll_interval
+            )
+            positives = [self.parse_positive(r, n) for r, n in zip(raw, neutrals)]
+
+        return [
+            TriadicResult(t, e, neg, neu, pos, self.analyze(neg, neu, pos))
+            for t, e, neg, neu, pos in zip(topics, explanations, negatives, neutrals, positives)
+        ]
+
+    async def _batch_complete(self, client, prompts: List[str],
+                              poll_interval: float, max_tokens: int = 500) -> List[str]:
+        # full (non-streamed) answers are cached under the plain key, so a
+        # rerun only submits prompts no earlier batch has answered; this
+        # also reuses POSITIVE answers from interactive runs, but not
+        # NEGATIVE ones, which those stream and store as early-stopped
+        # entries under a separate key
+        keys = [self._response_key("openai/gpt-4o-mini", p, max_tokens) for p in prompts]
+        out = [self.cache.get(k) for k in keys]
+        todo = [i for i, o in enumerate(out) if not o]
+        if not todo:
+            return out
+
+        lines = [
+            orjson.dumps({
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": "gpt-4o-mini",
+                    "messages": [{"role": "user", "content": prompts[i]}],
+                    "temperature": 0.1,
+                    "max_tokens": max_tokens
+                }
+            })
+            for i in todo
+        ]
+        batch_file = await client.files.create(
+            file=("triadic_batch.jsonl", b"\n".join(lines)), purpose="batch"
+        )
+        batch = await client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        print("BATCH SUBMITTED:", batch.id, f"({len(todo)} requests)")
+
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            await asyncio.sleep(poll_interval)
+            batch = await client.batches.retrieve(batch.id)
+        if batch.status != "completed":
+            print("BATCH ERROR:", batch.id, batch.status)
+
+        # expired batches can still carry partial output
+        if batch.output_file_id:
+            content = await client.files.content(batch.output_file_id)
+            for line in content.text.splitlines():
+                rec = orjson.loads(line)
+                i = int(rec["custom_id"])
+                resp = rec.get("response") or {}
+                if resp.get("status_code") != 200:
+                    continue
+                text = resp["body"]["choices"][0]["message"]["content"].strip()
+                if text:
+                    self.cache.set(keys[i], text)
+                out[i] = text
+
+        # missing answers surface as failed extractions in the diagnostics
+        return [o or "" for o in out]
+
+
+    # ========================================================
+    # PREFETCH (likely follow-up topics)
+    # ========================================================
+    async def _prefetch(self, topic: str):
+        prompt = f"""
+List 3 closely related scientific topics someone studying the topic below is likely to ask about next.
+
+\"\"\"{topic}\"\"\"
+
+Phrase each as a physical process, one per line, no numbering.
+"""
+        try:
+            raw = await self.acall("openai/gpt-4o-mini", prompt, max_tokens=100)
+            # skip preambles like "Here are three related topics:"
+            related = [m for m in _ITEM_RE.findall(raw) if m and not m.endswith(":")][:3]
+
+            for t in related:
+                if self._prefetch_budget <= 0:
+                    return
+                self._prefetch_budget -= 1
+                async with self._prefetch_sem:
+                    await self.run(t, prefetch=False)
+        except Exception as e:
+            print("PREFETCH ERROR:", e)
+
+
+    # ========================================================
+    # RUN MANY TOPICS (concurrent fan-out)
+    # ========================================================
+    async def run_many(self, topics: List[str], max_concurrency: int = 8
+                       ) -> List[Union[TriadicResult, BaseException]]:
+        # stages inside one topic stay serial; topics run side by side,
+        # at most max_concurrency at a time to respect provider rate limits
+        sem = asyncio.Semaphore(max_concurrency)
+
+        async def bounded(t):
+            async with sem:
+                # a batch has no idle time to fill, so skip prefetching
+                return await self.run(t, prefetch=False)
+
+        # one failing topic must not sink the rest of the batch
+        return await asyncio.gather(*map(bounded, topics), return_exceptions=True)
 
 
 
 # ============================================================
 # EXECUTION
 # ============================================================
-if __name__ == "__main__":
-    agent = TriadicAgent()
-    result = agent.run(topic)
-
+def print_result(result: TriadicResult):
     print("===== TRIADIC AGENT v7.0 =====")
     print("TOPIC:", result.topic, "\n")
     print("EXPLANATION:", result.explanation, "\n")
@@ -283,3 +1190,40 @@ if __name__ == "__main__":
     print("\nDIAGNOSTICS:")
     for d in result.diagnostics:
         print(" ", d)
+
+
+async def main(args):
+    mode = "sequential" if args.mode == "batch" else args.mode
+    # the process exits right after printing, so nothing to prefetch for
+    async with TriadicAgent(mode=mode, prefetch_budget=0, speculate=args.speculate) as agent:
+        topics = [topic]
+        if args.topics:
+            with open(args.topics, encoding="utf-8") as f:
+                topics = [l.strip() for l in f if l.strip()]
+
+        if args.mode == "batch":
+            results = await agent.run_batch(topics)
+        elif not args.topics:
+            print_result(await agent.run(topic))
+            return
+        else:
+            results = await agent.run_many(topics, max_concurrency=args.concurrency)
+        for t, result in zip(topics, results):
+            if isinstance(result, BaseException):
+                print("===== TRIADIC AGENT v7.0 =====")
+                print("TOPIC:", t, "\n")
+                print("RUN ERROR:", result, "\n")
+                continue
+            print_result(result)
+            print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Triadic Agent v7.0")
+    parser.add_argument("--topics", help="file with one topic per line (default: the topic variable)")
+    parser.add_argument("--concurrency", type=int, default=8, help="topics processed at once")
+    parser.add_argument("--mode", choices=["sequential", "fused", "batch"], default="sequential",
+                        help="batch = OpenAI Batch API for the gpt-4o-mini stages (slow, cheap)")
+    parser.add_argument("--speculate", action="store_true",
+                        help="start each stage on a stable partial list of the previous one")
+    asyncio.run(main(parser.parse_args()))